@@ -1,114 +1,119 @@
 """Utilities for constructing cascade trees and computing structural metrics without networkx.
 
-This module avoids external dependencies by representing a tree as a simple
-adjacency list (a dictionary mapping nodes to sets of children).  It
-provides functions to build such a structure from a `Cascade` and to compute
-basic structural properties of the resulting tree.
+This module avoids external dependencies by representing a tree in CSR
+(compressed sparse row) form: each distinct user is assigned a dense index,
+and the children of node ``i`` live in ``children[indptr[i]:indptr[i + 1]]``.
+Compared to a dict-of-sets adjacency this keeps the structure in two flat
+int32 arrays, so the BFS and the metric reductions scan contiguous memory
+instead of hashing node IDs and iterating sets of boxed ints.
 """
 
 from __future__ import annotations
 
-from typing import Dict, Set, List
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
 
-from .cascade import Cascade
+import numpy as np
 
+from ._tree_kernels import tree_metrics
+from .cascade import Event
 
-Adjacency = Dict[int, Set[int]]
 
+@dataclass
+class CascadeTree:
+    """CSR adjacency of a cascade tree over dense node indices.
 
-def build_tree(cascade: Cascade) -> Adjacency:
-    """Construct an adjacency list representing the cascade tree.
-
-    Parameters
+    Attributes
     ----------
-    cascade: `Cascade`
-        The cascade from which to build the tree.  The root user and all
-        retweet events are used to build a directed tree where edges go
-        from parent to child.
-
-    Returns
-    -------
-    adjacency: dict
-        A dictionary mapping each node to a set of its children.  Nodes
-        with no children will have an empty set.  The root node is
-        included even if it has no children.
+    indptr: np.ndarray
+        int32 array of length ``n_nodes + 1``; the children of node ``i``
+        are ``children[indptr[i]:indptr[i + 1]]``.
+    children: np.ndarray
+        int32 array of child node indices, grouped by parent.
+    root_idx: int
+        Dense index of the root user (always 0).
+    n_nodes: int
+        Number of distinct users in the tree, including the root.
+    """
+
+    indptr: np.ndarray
+    children: np.ndarray
+    root_idx: int
+    n_nodes: int
+
+
+def build_tree(root: int, events: List[Event]) -> CascadeTree:
+    """Construct a CSR tree from a root user and its retweet events.
+
+    Each distinct user (root, event users and event parents) is assigned a
+    dense index on first sight; the root always gets index 0.  Edges go from
+    parent to child.  Since events are deduplicated per user, each child has
+    at most one incoming edge.  Taking the root and event list directly
+    (rather than a `Cascade`) lets the prefix pipeline stream event slices
+    without wrapping them in throwaway cascade objects.
     """
-    adj: Adjacency = {}
-    # ensure root exists
-    adj.setdefault(cascade.root, set())
-    for event in cascade.events:
-        # ensure parent and child nodes are present
-        adj.setdefault(event.parent, set())
-        adj.setdefault(event.user, set())
-        adj[event.parent].add(event.user)
-    return adj
-
-
-def compute_depths(adj: Adjacency, root: int) -> Dict[int, int]:
+    index: Dict[int, int] = {root: 0}
+    n_events = len(events)
+    parents = np.empty(n_events, dtype=np.int32)
+    kids = np.empty(n_events, dtype=np.int32)
+    for i, event in enumerate(events):
+        p = index.setdefault(event.parent, len(index))
+        c = index.setdefault(event.user, len(index))
+        parents[i] = p
+        kids[i] = c
+    n_nodes = len(index)
+    counts = np.bincount(parents, minlength=n_nodes).astype(np.int32)
+    indptr = np.zeros(n_nodes + 1, dtype=np.int32)
+    np.cumsum(counts, out=indptr[1:])
+    # second pass: scatter children into their parent's CSR slot
+    fill = indptr[:-1].copy()
+    children = np.empty(n_events, dtype=np.int32)
+    for i in range(n_events):
+        p = parents[i]
+        children[fill[p]] = kids[i]
+        fill[p] += 1
+    return CascadeTree(indptr=indptr, children=children, root_idx=0, n_nodes=n_nodes)
+
+
+def compute_depths(tree: CascadeTree) -> np.ndarray:
     """Compute depths of nodes reachable from the root in the tree.
 
-    Nodes unreachable from the root have a depth of -1.  Depth of the root
-    is 0.  Uses a simple breadth‑first search.
+    Returns an int32 array indexed by dense node index.  Nodes unreachable
+    from the root have a depth of -1; the root has depth 0.  Uses a
+    breadth-first search over the CSR arrays with explicit head/tail
+    pointers, so no per-node allocation happens inside the loop.
     """
-    depths: Dict[int, int] = {node: -1 for node in adj}
-    if root not in adj:
-        return depths
-    depths[root] = 0
-    queue: List[int] = [root]
-    while queue:
-        current = queue.pop(0)
-        for child in adj.get(current, set()):
-            if depths[child] == -1 or depths[child] > depths[current] + 1:
-                depths[child] = depths[current] + 1
-                queue.append(child)
+    n = tree.n_nodes
+    depths = np.full(n, -1, dtype=np.int32)
+    depths[tree.root_idx] = 0
+    queue = np.empty(n, dtype=np.int32)
+    queue[0] = tree.root_idx
+    head, tail = 0, 1
+    indptr, children = tree.indptr, tree.children
+    while head < tail:
+        current = queue[head]
+        head += 1
+        next_depth = depths[current] + 1
+        for child in children[indptr[current]:indptr[current + 1]]:
+            if depths[child] != -1:
+                continue
+            depths[child] = next_depth
+            queue[tail] = child
+            tail += 1
     return depths
 
 
-def structural_metrics(adj: Adjacency, root: int) -> Dict[str, float]:
-    """Compute structural metrics from an adjacency list.
+def structural_metrics(tree: CascadeTree) -> Tuple[float, float, float, float, float]:
+    """Compute structural metrics from a CSR cascade tree.
 
-    Metrics include:
+    Returns a fixed-order tuple of:
     - `depth`: maximum distance from root to any reachable node.
     - `avg_depth`: average depth of reachable nodes.
     - `leaves`: number of leaf nodes (nodes with zero children).
     - `branching_factor`: average number of children of non‑leaf nodes.
     - `wiener_root_avg`: average distance from the root to all reachable nodes.
 
-    Nodes unreachable from the root are ignored.
+    Nodes unreachable from the root are ignored.  The BFS and all
+    reductions run fused in a single Numba-compiled kernel.
     """
-    if root not in adj:
-        # no tree
-        return {
-            "depth": 0.0,
-            "avg_depth": 0.0,
-            "leaves": 1.0,
-            "branching_factor": 0.0,
-            "wiener_root_avg": 0.0,
-        }
-    depths = compute_depths(adj, root)
-    reachable = [node for node, d in depths.items() if d >= 0]
-    if not reachable:
-        return {
-            "depth": 0.0,
-            "avg_depth": 0.0,
-            "leaves": 1.0,
-            "branching_factor": 0.0,
-            "wiener_root_avg": 0.0,
-        }
-    max_depth = max(depths[node] for node in reachable)
-    avg_depth = sum(depths[node] for node in reachable) / len(reachable)
-    leaves = [node for node in reachable if len(adj.get(node, set())) == 0]
-    n_leaves = float(len(leaves))
-    non_leaves = [node for node in reachable if len(adj.get(node, set())) > 0]
-    if non_leaves:
-        branching = sum(len(adj[node]) for node in non_leaves) / len(non_leaves)
-    else:
-        branching = 0.0
-    wiener = sum(depths[node] for node in reachable) / len(reachable)
-    return {
-        "depth": float(max_depth),
-        "avg_depth": float(avg_depth),
-        "leaves": float(n_leaves),
-        "branching_factor": float(branching),
-        "wiener_root_avg": float(wiener),
-    }
+    return tree_metrics(tree.indptr, tree.children, tree.root_idx)
@@ -11,10 +11,14 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Represents a single retweet event in a cascade.
 
+    Uses ``slots=True`` since a cascade dataset holds one `Event` per
+    retweet: dropping the per-instance ``__dict__`` roughly halves the
+    memory per event and makes attribute access a fixed-offset load.
+
     Attributes
     ----------
     user: int
@@ -90,18 +94,21 @@ def earliest_event_by_user(events: List[Event]) -> List[Event]:
     Parameters
     ----------
     events: list of `Event`
-        The events parsed from a cascade.  Multiple events may have the same
-        `.user` because a user can appear in several retweet paths.  Only the
-        earliest event is kept for each user.
+        The events parsed from a cascade, **sorted by time ascending**.
+        Multiple events may have the same `.user` because a user can appear
+        in several retweet paths.  Since the input is time-ordered, the
+        first occurrence of a user is its earliest event, so a single
+        `setdefault` per event suffices (one hash probe instead of up to
+        three with a membership test plus comparison).
 
     Returns
     -------
     list of `Event`
         A new list of events containing at most one event per user, the
-        earliest by time.
+        earliest by time.  Insertion order equals time order, so the
+        result is already sorted.
     """
     by_user: Dict[int, Event] = {}
     for ev in events:
-        if ev.user not in by_user or ev.time < by_user[ev.user].time:
-            by_user[ev.user] = ev
+        by_user.setdefault(ev.user, ev)
     return list(by_user.values())
@@ -3,15 +3,25 @@
 from __future__ import annotations
 
 from typing import List, Dict
-from collections import Counter
 
+import numpy as np
 
-def label_distribution(labels: List[int]) -> Counter:
-    """Return a Counter of label occurrences."""
-    return Counter(labels)
 
+def label_distribution(labels: List[int]) -> Dict[int, int]:
+    """Return a mapping of label value to occurrence count.
 
-def print_results(k: int, num_prefixes: int, distribution: Counter, results: Dict[str, Dict[str, float]], importances: List[tuple]) -> None:
+    Labels are small non-negative ints, so `np.bincount` counts them in a
+    single vectorized pass instead of hashing each entry; only labels that
+    actually occur appear in the result.
+    """
+    arr = np.asarray(labels)
+    if arr.size == 0:
+        return {}
+    counts = np.bincount(arr, minlength=2)
+    return {i: int(c) for i, c in enumerate(counts) if c}
+
+
+def print_results(k: int, num_prefixes: int, distribution: Dict[int, int], results: Dict[str, Dict[str, float]], importances: List[tuple]) -> None:
     """Pretty‑print evaluation results for a given k.
 
     Parameters
@@ -20,7 +30,7 @@ def print_results(k: int, num_prefixes: int, distribution: Counter, results: Dic
         The prefix length.
     num_prefixes: int
         Number of prefix cascades used.
-    distribution: collections.Counter
+    distribution: dict
         Counts of labels (0/1).
     results: dict
         Nested dictionary with metrics for each model.
@@ -29,7 +39,7 @@ def print_results(k: int, num_prefixes: int, distribution: Counter, results: Dic
     """
     print(f"=== Results for k={k} ===")
     print(f"Number of prefix cascades: {num_prefixes}")
-    print(f"Label distribution: {dict(distribution)}")
+    print(f"Label distribution: {distribution}")
     for model_name, metrics in results.items():
         print(f"{model_name} accuracy: {metrics['accuracy']:.3f}, F1: {metrics['f1']:.3f}, AUC: {metrics['auc']:.3f}")
     if importances:
@@ -2,18 +2,41 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Tuple
 import numpy as np
 
-from .cascade import Cascade
+from .cascade import Cascade, Event
 from .build_tree import build_tree, structural_metrics
 
 
-def temporal_features(prefix: Cascade) -> Dict[str, float]:
+#: Column order of the matrix returned by `temporal_features_batch`.
+TEMPORAL_FEATURE_NAMES = (
+    "time_to_k",
+    "mean_inter_time",
+    "var_inter_time",
+    "half_life_ratio",
+    "speed_change",
+)
+
+#: Column order of the structural features written by `fill_structural_features`.
+STRUCTURAL_FEATURE_NAMES = (
+    "depth",
+    "avg_depth",
+    "leaves",
+    "branching_factor",
+    "wiener_root_avg",
+    "num_nodes",
+)
+
+#: Column order of a full feature row; used to label feature importances.
+FEATURE_NAMES = TEMPORAL_FEATURE_NAMES + STRUCTURAL_FEATURE_NAMES
+
+
+def temporal_features(prefix: Cascade) -> Tuple[float, float, float, float, float]:
     """Compute temporal features from a prefix cascade.
 
-    The events in the prefix should already be sorted by time.  The
-    following features are extracted:
+    The events in the prefix should already be sorted by time.  Returns a
+    tuple in `TEMPORAL_FEATURE_NAMES` order:
 
     - `time_to_k`: time of the k‑th retweet (last event).
     - `mean_inter_time`: average inter‑retweet time.
@@ -51,28 +74,181 @@ def temporal_features(prefix: Cascade) -> Dict[str, float]:
         var_diff = 0.0
         half_ratio = 0.0
         speed_change = 0.0
-    return {
-        "time_to_k": t_k,
-        "mean_inter_time": mean_diff,
-        "var_inter_time": var_diff,
-        "half_life_ratio": half_ratio,
-        "speed_change": speed_change,
-    }
+    return (t_k, mean_diff, var_diff, half_ratio, speed_change)
+
+
+def temporal_features_batch(event_lists: List[List[Event]], out: np.ndarray = None) -> np.ndarray:
+    """Compute temporal features for a batch of equal-length prefixes.
+
+    All prefixes produced for a given `k` have exactly `k` events, so their
+    event times can be stacked into a single ``(M, k)`` matrix and every
+    feature computed as a vectorized column reduction, instead of making M
+    Python-level calls that each allocate a small times array.  Events must
+    already be sorted by time (the parser guarantees this).
+
+    Returns an ``(M, 5)`` float64 matrix with columns in
+    `TEMPORAL_FEATURE_NAMES` order, matching `temporal_features`.  If `out`
+    is given (e.g. a view into a pre-allocated feature matrix), results are
+    written there instead of into a fresh array.
+    """
+    m = len(event_lists)
+    k = len(event_lists[0])
+    times = np.fromiter(
+        (e.time for evs in event_lists for e in evs), dtype=np.float64, count=m * k
+    ).reshape(m, k)
+    if out is None:
+        out = np.zeros((m, 5), dtype=np.float64)
+    else:
+        out[...] = 0.0
+    t_k = times[:, -1]
+    out[:, 0] = t_k
+    if k > 1:
+        diffs = np.diff(times, axis=1)
+        out[:, 1] = diffs.mean(axis=1)
+        out[:, 2] = diffs.var(axis=1)
+        half_k = k // 2
+        t_half = times[:, half_k - 1]
+        np.divide(t_half, t_k, out=out[:, 3], where=t_k > 0)
+        # speed change: average inter time in first half vs second half
+        second_diffs = diffs[:, half_k:]
+        if second_diffs.shape[1] > 0:
+            first_mean = diffs[:, :half_k].mean(axis=1)
+            second_mean = second_diffs.mean(axis=1)
+            np.divide(first_mean, second_mean, out=out[:, 4], where=second_mean > 0)
+    return out
+
+
+def structural_row(root: int, events: List[Event]) -> Tuple[float, ...]:
+    """Compute the structural features of one prefix as a fixed-order tuple.
+
+    Values follow `STRUCTURAL_FEATURE_NAMES` order, without building an
+    intermediate dict.
+    """
+    tree = build_tree(root, events)
+    return structural_metrics(tree) + (float(tree.n_nodes),)
+
+
+def structural_row_indexed(item: Tuple[int, int, List[Event]]) -> Tuple[int, Tuple[float, ...]]:
+    """Pool worker: map an ``(i, root, events)`` tuple to ``(i, values)``.
+
+    Prefixes are independent, so structural extraction parallelizes over a
+    process pool; carrying the row index through lets the caller scatter
+    results from `imap_unordered` into a pre-allocated matrix regardless of
+    completion order.
+    """
+    i, root, events = item
+    return i, structural_row(root, events)
+
+
+def structural_rows_multi_k(root: int, events: List[Event], ks: List[int]) -> List[Tuple[float, ...]]:
+    """Compute structural feature rows for several prefix lengths in one pass.
+
+    A k2-prefix tree contains the k1-prefix tree for k1 < k2, so instead of
+    rebuilding the tree per k this replays the (time-sorted) events once,
+    growing an adjacency map and updating the depth/leaf/branching counters
+    incrementally as each edge is inserted.  When a node becomes reachable
+    its already-inserted subtree is walked exactly once, so total work is
+    linear in the longest prefix regardless of how many ks are requested.
+
+    `ks` must be sorted ascending; entries larger than ``len(events)`` are
+    ignored.  Returns one `STRUCTURAL_FEATURE_NAMES`-ordered tuple per
+    applicable k, matching `structural_row` on the corresponding prefix.
+    """
+    depths: Dict[int, int] = {root: 0}
+    seen = {root}
+    # child lists are allocated lazily, so leaf nodes (the majority in wide
+    # cascades) never get an empty list; a missing entry means "no children"
+    children: Dict[int, List[int]] = {}
+    n_nodes = 1
+    max_depth = 0
+    depth_sum = 0
+    reachable = 1
+    n_leaves = 1  # the root starts as a reachable leaf
+    non_leaves = 0
+    child_sum = 0
+    rows: List[Tuple[float, ...]] = []
+    ki = 0
+    n_ks = len(ks)
+    for idx, ev in enumerate(events, start=1):
+        parent, child = ev.parent, ev.user
+        if parent not in seen:
+            seen.add(parent)
+            n_nodes += 1
+        if child not in seen:
+            seen.add(child)
+            n_nodes += 1
+        parent_children = children.get(parent)
+        if parent_children is None:
+            parent_children = children[parent] = [child]
+            parent_was_leaf = True
+        else:
+            parent_children.append(child)
+            parent_was_leaf = False
+        parent_depth = depths.get(parent)
+        if parent_depth is not None:
+            # reachable parent gained a child
+            child_sum += 1
+            if parent_was_leaf:
+                n_leaves -= 1
+                non_leaves += 1
+            if child not in depths:
+                # the child (and any subtree inserted while it was
+                # unreachable) becomes reachable now
+                stack = [(child, parent_depth + 1)]
+                while stack:
+                    node, d = stack.pop()
+                    depths[node] = d
+                    reachable += 1
+                    depth_sum += d
+                    if d > max_depth:
+                        max_depth = d
+                    node_children = children.get(node)
+                    if node_children:
+                        non_leaves += 1
+                        child_sum += len(node_children)
+                        for grandchild in node_children:
+                            if grandchild not in depths:
+                                stack.append((grandchild, d + 1))
+                    else:
+                        n_leaves += 1
+        if ki < n_ks and idx == ks[ki]:
+            avg_depth = depth_sum / reachable
+            branching = child_sum / non_leaves if non_leaves else 0.0
+            rows.append(
+                (float(max_depth), avg_depth, float(n_leaves), branching, avg_depth, float(n_nodes))
+            )
+            ki += 1
+    return rows
+
+
+def structural_rows_multi_k_indexed(
+    item: Tuple[int, int, List[Event], List[int]]
+) -> Tuple[int, List[Tuple[float, ...]]]:
+    """Pool worker: map ``(i, root, events, ks)`` to ``(i, rows)``.
+
+    Same scatter-by-index pattern as `structural_row_indexed`, but one work
+    item covers all prefix lengths of a cascade.
+    """
+    i, root, events, ks = item
+    return i, structural_rows_multi_k(root, events, ks)
+
+
+def fill_structural_features(root: int, events: List[Event], row: np.ndarray) -> None:
+    """Write the structural features of one prefix into a feature-matrix row.
+
+    Writes columns ``5..10`` of `row` (the `STRUCTURAL_FEATURE_NAMES` slots
+    of `FEATURE_NAMES` order) positionally.  The temporal columns ``0..4``
+    are left untouched so they can be filled by `temporal_features_batch`.
+    """
+    row[5:11] = structural_row(root, events)
 
 
-def extract_features(prefix: Cascade) -> Dict[str, float]:
-    """Extract a combined set of temporal and structural features for a prefix.
+def extract_features(prefix: Cascade) -> Tuple[float, ...]:
+    """Extract the combined temporal and structural features for a prefix.
 
-    This function merges the temporal features with structural metrics computed
-    on the cascade tree.
+    Returns a fixed-order tuple following `FEATURE_NAMES`; no per-feature
+    dict is constructed.
     """
     # ensure events sorted
     prefix.sort_events()
-    feat = temporal_features(prefix)
-    # structural features
-    G = build_tree(prefix)
-    struct = structural_metrics(G, prefix.root)
-    # add number of nodes (including root) as a feature
-    struct["num_nodes"] = float(len(G))
-    feat.update(struct)
-    return feat
+    return temporal_features(prefix) + structural_row(prefix.root, prefix.events)
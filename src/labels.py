@@ -4,16 +4,14 @@ from __future__ import annotations
 
 from typing import Dict, List
 
-from .cascade import Cascade
 
-
-def construct_labels(prefixes: List[Cascade], full_sizes: Dict[int, int], k: int) -> List[int]:
+def construct_labels(cids: List[int], full_sizes: Dict[int, int], k: int) -> List[int]:
     """Create binary labels for prefix cascades based on the doubling rule.
 
     Parameters
     ----------
-    prefixes: list of `Cascade`
-        A list of k‑prefix cascades.  Each prefix must have exactly `k` events.
+    cids: list of int
+        Cascade IDs of the k‑prefixes, in prefix order.
     full_sizes: dict[int, int]
         A mapping from cascade ID to the total number of retweet events in
         the full cascade.
@@ -29,8 +27,7 @@ def construct_labels(prefixes: List[Cascade], full_sizes: Dict[int, int], k: int
     """
     labels: List[int] = []
     threshold = 2 * k
-    for pref in prefixes:
-        cid = pref.cid
+    for cid in cids:
         final_size = full_sizes.get(cid, 0)
         labels.append(1 if final_size >= threshold else 0)
     return labels
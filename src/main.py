@@ -21,6 +21,8 @@ if str(_root) not in _sys.path:
     _sys.path.insert(0, str(_root))
 
 import argparse
+import multiprocessing as mp
+import os
 from typing import List
 
 import numpy as np
@@ -28,14 +30,22 @@ import numpy as np
 # We import modules via the top‑level 'src' package name.  This works both
 # when running as a package (python -m src.main) and as a script (python src/main.py)
 from src.parse_data import parse_dataset
-from src.prefix import generate_prefix_cascades
-from src.features import extract_features
+from src.features import (
+    FEATURE_NAMES,
+    structural_rows_multi_k,
+    structural_rows_multi_k_indexed,
+    temporal_features_batch,
+)
 from src.labels import construct_labels
 from src.models import train_models, evaluate_models, feature_importances
 from src.evaluation import label_distribution, print_results
 
 from sklearn.model_selection import train_test_split
 
+# Below this many prefixes the pool start-up and pickling overhead outweighs
+# the parallel speedup, so structural extraction runs serially.
+PARALLEL_MIN_PREFIXES = 4096
+
 
 def main():
     parser = argparse.ArgumentParser(description="Predict cascade growth using early retweets.")
@@ -52,19 +62,55 @@ def main():
         return
     # Map from cascade ID to final size
     full_sizes = {c.cid: c.n_events() for c in cascades}
+    # The k2-prefix tree extends the k1-prefix tree for k1 < k2, so
+    # structural features for every k come out of a single incremental
+    # pass per cascade instead of one tree build per (cascade, k).
+    # The per-cascade passes are independent; fan them out over a process
+    # pool for large datasets and scatter results back by cascade index.
+    ks_sorted = sorted(set(args.ks))
+    eligible = [c for c in cascades if c.n_events() >= ks_sorted[0]]
+    rows_by_cascade: List[list] = [None] * len(eligible)
+    n_workers = os.cpu_count() or 1
+    if n_workers > 1 and len(eligible) >= PARALLEL_MIN_PREFIXES:
+        chunksize = max(1, len(eligible) // (n_workers * 8))
+        with mp.Pool(n_workers) as pool:
+            for i, rows in pool.imap_unordered(
+                structural_rows_multi_k_indexed,
+                ((i, c.root, c.events, ks_sorted) for i, c in enumerate(eligible)),
+                chunksize=chunksize,
+            ):
+                rows_by_cascade[i] = rows
+    else:
+        for i, c in enumerate(eligible):
+            rows_by_cascade[i] = structural_rows_multi_k(c.root, c.events, ks_sorted)
+    # Regroup per k: cascade IDs, event slices and structural rows
+    per_k_cids = {k: [] for k in ks_sorted}
+    per_k_events = {k: [] for k in ks_sorted}
+    per_k_struct = {k: [] for k in ks_sorted}
+    for c, rows in zip(eligible, rows_by_cascade):
+        applicable = (k for k in ks_sorted if k <= c.n_events())
+        for k, row in zip(applicable, rows):
+            per_k_cids[k].append(c.cid)
+            per_k_events[k].append(c.events[:k])
+            per_k_struct[k].append(row)
     # Evaluate for each k
-    for k in args.ks:
-        # Generate k‑prefix cascades
-        prefixes = generate_prefix_cascades(cascades, k)
-        if not prefixes:
+    for k in ks_sorted:
+        cids_list = per_k_cids[k]
+        event_lists = per_k_events[k]
+        if not event_lists:
             print(f"k={k}: no cascades have at least {k} retweets. Skipping.")
             continue
-        # Extract features
-        feature_dicts = [extract_features(p) for p in prefixes]
-        feature_names = list(feature_dicts[0].keys())
-        X = np.array([[fd[name] for name in feature_names] for fd in feature_dicts], dtype=float)
-        # Labels
-        y = np.array(construct_labels(prefixes, full_sizes, k), dtype=int)
+        # Assemble the feature matrix: temporal columns in one vectorized
+        # batch, structural columns from the incremental pass.  float32 is
+        # ample precision for these counts/ratios/times and halves the
+        # bandwidth through the scaler and tree-split evaluation; sklearn
+        # accepts it natively without an internal upcast copy.
+        feature_names = list(FEATURE_NAMES)
+        X = np.empty((len(event_lists), len(FEATURE_NAMES)), dtype=np.float32)
+        temporal_features_batch(event_lists, out=X[:, :5])
+        X[:, 5:] = per_k_struct[k]
+        # Labels (0/1, so a single byte each)
+        y = np.array(construct_labels(cids_list, full_sizes, k), dtype=np.int8)
         dist = label_distribution(y)
         # Skip if only one class
         if len(dist) < 2:
@@ -72,12 +118,18 @@ def main():
             continue
         # Train/test split by cascade (we ensure no cascade appears in both sets)
         # We'll split indices of prefixes by their cascade IDs
-        cids = np.array([p.cid for p in prefixes])
+        cids = np.array(cids_list)
         # Unique cascade IDs in prefixes
         unique_cids = np.unique(cids)
         train_cids, test_cids = train_test_split(unique_cids, test_size=args.test_size, random_state=args.random_state)
-        train_mask = np.isin(cids, train_cids)
-        test_mask = np.isin(cids, test_cids)
+        # One hashed membership pass instead of two np.isin scans; every
+        # cid is in exactly one of the two splits, so the test mask is
+        # just the complement
+        train_cid_set = set(train_cids.tolist())
+        train_mask = np.fromiter(
+            (cid in train_cid_set for cid in cids_list), dtype=bool, count=len(cids_list)
+        )
+        test_mask = ~train_mask
         X_train, X_test = X[train_mask], X[test_mask]
         y_train, y_test = y[train_mask], y[test_mask]
         # Train models
@@ -87,7 +139,7 @@ def main():
         # Feature importances from RF
         importances = feature_importances(models['rf'], feature_names, top_n=10)
         # Print results
-        print_results(k, len(prefixes), dist, results, importances)
+        print_results(k, len(event_lists), dist, results, importances)
 
 
 if __name__ == '__main__':
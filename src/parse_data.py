@@ -18,6 +18,7 @@ unique retweets discovered.
 from __future__ import annotations
 
 import logging
+import mmap
 from typing import List
 
 from .cascade import Cascade, Event, earliest_event_by_user
@@ -35,65 +36,80 @@ def parse_dataset(path: str) -> List[Cascade]:
     -------
     list of `Cascade`
         The parsed cascades.  Cascades with no events are ignored.
+
+    The file is memory-mapped and read line-by-line as bytes, so the OS
+    pages data in on demand instead of Python buffering and decoding the
+    whole stream; each line is decoded exactly once.  Field splits are
+    bounded (``split('\\t', 4)``, ``partition``) so no token list longer
+    than needed is ever allocated.
     """
     cascades: List[Cascade] = []
-    with open(path, 'r', encoding='utf-8') as f:
-        for lineno, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue  # skip blank lines
-            parts = line.split('\t')
-            if len(parts) < 5:
-                logging.warning(f"Line {lineno}: expected at least 5 fields, got {len(parts)}")
-                continue
-            try:
-                cid = int(parts[0])
-                root = int(parts[1])
-                publish_time = float(parts[2])
-                retweet_number = int(parts[3])
-            except ValueError as e:
-                logging.warning(f"Line {lineno}: failed to parse numeric fields: {e}")
-                continue
-            cascade = Cascade(cid=cid, root=root, publish_time=publish_time)
-            # parse retweet paths
-            events: List[Event] = []
-            retweets = parts[4].split(' ')
-            for item in retweets:
-                if not item:
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # an empty file cannot be mapped
+            return cascades
+        with mm:
+            for lineno, raw in enumerate(iter(mm.readline, b''), start=1):
+                line = raw.decode('utf-8').strip()
+                if not line:
+                    continue  # skip blank lines
+                parts = line.split('\t', 4)
+                if len(parts) < 5:
+                    logging.warning(f"Line {lineno}: expected at least 5 fields, got {len(parts)}")
                     continue
                 try:
-                    path_part, time_part = item.split(':')
-                    time_rel = float(time_part)
-                except ValueError:
-                    logging.warning(f"Line {lineno}: malformed retweet entry '{item}'")
-                    continue
-                # path_part can have multiple segments separated by '/'
-                users = path_part.split('/')
-                if not users:
+                    cid = int(parts[0])
+                    root = int(parts[1])
+                    publish_time = float(parts[2])
+                    retweet_number = int(parts[3])
+                except ValueError as e:
+                    logging.warning(f"Line {lineno}: failed to parse numeric fields: {e}")
                     continue
-                # The last user is the retweeter, the previous is the parent (if any)
-                try:
-                    user_ids = [int(u) for u in users]
-                except ValueError:
-                    logging.warning(f"Line {lineno}: non‑integer user ID in '{item}'")
+                cascade = Cascade(cid=cid, root=root, publish_time=publish_time)
+                # parse retweet paths
+                events: List[Event] = []
+                retweets = parts[4].split(' ')
+                for item in retweets:
+                    if not item:
+                        continue
+                    path_part, colon, time_part = item.partition(':')
+                    if not colon:
+                        logging.warning(f"Line {lineno}: malformed retweet entry '{item}'")
+                        continue
+                    try:
+                        time_rel = float(time_part)
+                    except ValueError:
+                        logging.warning(f"Line {lineno}: malformed retweet entry '{item}'")
+                        continue
+                    # path_part can have multiple segments separated by '/', but
+                    # only the last two matter: the retweeter and its parent.
+                    # rpartition keeps parsing O(1) in path depth instead of
+                    # converting every intermediate user ID.
+                    head, sep, tail = path_part.rpartition('/')
+                    try:
+                        child = int(tail)
+                        if not sep:
+                            # direct retweet from root
+                            parent = root
+                        else:
+                            _, _, parent_str = head.rpartition('/')
+                            parent = int(parent_str) if parent_str else int(head)
+                    except ValueError:
+                        logging.warning(f"Line {lineno}: non‑integer user ID in '{item}'")
+                        continue
+                    events.append(Event(user=child, parent=parent, time=time_rel))
+                # sort once, then deduplicate by first (= earliest) occurrence;
+                # the deduped list stays time-ordered so no re-sort is needed
+                events.sort(key=lambda e: e.time)
+                deduped = earliest_event_by_user(events)
+                if len(deduped) < retweet_number:
+                    logging.info(
+                        f"Line {lineno}: declared {retweet_number} retweets but only {len(deduped)} unique users; duplicates were removed"
+                    )
+                cascade.events = deduped
+                if cascade.n_events() == 0:
                     continue
-                if len(user_ids) == 1:
-                    # direct retweet from root
-                    child = user_ids[0]
-                    parent = root
-                else:
-                    child = user_ids[-1]
-                    parent = user_ids[-2]
-                events.append(Event(user=child, parent=parent, time=time_rel))
-            # deduplicate events by earliest occurrence
-            deduped = earliest_event_by_user(events)
-            if len(deduped) < retweet_number:
-                logging.info(
-                    f"Line {lineno}: declared {retweet_number} retweets but only {len(deduped)} unique users; duplicates were removed"
-                )
-            cascade.events = deduped
-            cascade.sort_events()
-            if cascade.n_events() == 0:
-                continue
-            cascades.append(cascade)
+                cascades.append(cascade)
     return cascades
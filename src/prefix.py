@@ -2,9 +2,25 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Iterator, List, Tuple
 
-from .cascade import Cascade
+from .cascade import Cascade, Event
+
+
+def iter_k_prefixes(cascades: List[Cascade], k: int) -> Iterator[Tuple[int, int, List[Event]]]:
+    """Yield ``(cid, root, events)`` k-prefix tuples from full cascades.
+
+    The parser already sorts each cascade's events by time, so the first
+    `k` events of the list *are* the k-prefix; this streams them as plain
+    tuples instead of re-sorting and allocating a copied `Cascade` per
+    prefix the way `get_k_prefix` does.  Cascades with fewer than `k`
+    events are skipped.  The yielded event list is a slice and must not
+    be mutated.
+    """
+    for cascade in cascades:
+        events = cascade.events
+        if len(events) >= k:
+            yield cascade.cid, cascade.root, events[:k]
 
 
 def generate_prefix_cascades(cascades: List[Cascade], k: int) -> List[Cascade]: